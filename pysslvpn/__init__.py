@@ -12,16 +12,38 @@ __author__ = "PySslvpn Developer"
 __email__ = "admin@proyy.com"
 __license__ = "GPL-3.0-or-later"
 
-from .main import SSLVPNAuthentication, SSLVPNSession, SSLVPNTunnelProtocol, NetworkConfigManager, SSLVPNClient
-from .config_manager import VPNConfigManager
-from .cli import main
+# 重量级名称通过PEP 562按需导入，避免在导入包时就加载TLS/TUN相关模块
+_LAZY_ATTRS = {
+    "SSLVPNAuthentication": ".main",
+    "SSLVPNSession": ".main",
+    "SSLVPNTunnelProtocol": ".main",
+    "NetworkConfigManager": ".main",
+    "SSLVPNClient": ".main",
+    "VPNConfigManager": ".config_manager",
+    "main": ".cli",
+}
 
 __all__ = [
     "SSLVPNAuthentication",
-    "SSLVPNSession", 
+    "SSLVPNSession",
     "SSLVPNTunnelProtocol",
     "NetworkConfigManager",
     "SSLVPNClient",
     "VPNConfigManager",
     "main",
-]
\ No newline at end of file
+]
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(module_name, __name__), name)
+    if module_name == ".main":
+        # 导入.main子模块时，导入系统会把包属性main绑定为该模块，
+        # 覆盖__all__中导出的CLI入口函数；这里立即重新绑定，
+        # 保证pysslvpn.main不随访问顺序变化，始终是cli.main
+        globals()["main"] = import_module(".cli", __name__).main
+    globals()[name] = value
+    return value
@@ -17,11 +17,11 @@ import sys
 import os
 import platform
 from .config_manager import VPNConfigManager
-from .main import SSLVPNClient, IS_WINDOWS
 
 async def start_vpn_connection(args, config_manager: VPNConfigManager):
     """启动VPN连接"""
-    from main import SSLVPNClient
+    # 延迟导入：只有connect子命令才需要加载TLS/TUN相关的重量级模块
+    from .main import SSLVPNClient
     
     # 获取配置
     if args.config:
@@ -62,14 +62,14 @@ async def start_vpn_connection(args, config_manager: VPNConfigManager):
     try:
         if await vpn_client.connect():
             if vpn_client.setup_tun_interface():
-                vpn_client.apply_network_configuration()
+                await vpn_client.apply_network_configuration()
                 await vpn_client.start_tunnel()
     except KeyboardInterrupt:
         print("\n断开连接...")
     finally:
         await vpn_client.cleanup()
 
-async def list_configs(config_manager: VPNConfigManager):
+def list_configs(config_manager: VPNConfigManager):
     """列出所有配置"""
     configs = config_manager.list_configs()
     default_config = config_manager.get_default_config()
@@ -84,7 +84,7 @@ async def list_configs(config_manager: VPNConfigManager):
         print(f"  {marker} {config_name}")
     print("\n(* 表示默认配置)")
 
-async def save_config(args, config_manager: VPNConfigManager):
+def save_config(args, config_manager: VPNConfigManager):
     """保存配置"""
     config = config_manager.create_config_from_args(args)
     
@@ -100,14 +100,14 @@ async def save_config(args, config_manager: VPNConfigManager):
     else:
         print(f"配置 '{args.name}' 已保存")
 
-async def delete_config(args, config_manager: VPNConfigManager):
+def delete_config(args, config_manager: VPNConfigManager):
     """删除配置"""
     if config_manager.delete_config(args.name):
         print(f"配置 '{args.name}' 已删除")
     else:
         print(f"错误: 配置 '{args.name}' 不存在")
 
-async def set_default_config(args, config_manager: VPNConfigManager):
+def set_default_config(args, config_manager: VPNConfigManager):
     """设置默认配置"""
     config = config_manager.load_connection_config(args.name)
     if config:
@@ -175,13 +175,13 @@ def main():
             sys.exit(1)
         asyncio.run(start_vpn_connection(args, config_manager))
     elif args.command == 'list':
-        asyncio.run(list_configs(config_manager))
+        list_configs(config_manager)
     elif args.command == 'save':
-        asyncio.run(save_config(args, config_manager))
+        save_config(args, config_manager)
     elif args.command == 'delete':
-        asyncio.run(delete_config(args, config_manager))
+        delete_config(args, config_manager)
     elif args.command == 'set-default':
-        asyncio.run(set_default_config(args, config_manager))
+        set_default_config(args, config_manager)
     else:
         parser.print_help()
 
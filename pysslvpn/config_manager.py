@@ -13,55 +13,118 @@
 import json
 import os
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+
+# JSON编解码：优先使用orjson（安装了speed扩展时可用），回退到stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dumps_indented(config: dict) -> bytes:
+    """序列化配置为两格缩进的JSON字节串"""
+    if orjson is not None:
+        return orjson.dumps(config, option=orjson.OPT_INDENT_2)
+    return json.dumps(config, indent=2).encode("utf-8")
+
+_loads = json.loads if orjson is None else orjson.loads
+
+# 默认配置缓存的哨兵值，用于区分"尚未读取"和"文件不存在"
+_UNSET = object()
+
+# 配置必填字段（模块加载时构建一次，校验用集合包含关系一趟完成）
+_REQUIRED_FIELDS = frozenset(("server", "port", "username"))
+
+# 配置目录路径缓存：目录字符串 -> expanduser展开后的Path
+_DIR_CACHE: Dict[str, Path] = {}
 
 class VPNConfigManager:
     """管理VPN配置文件"""
-    
+
     def __init__(self, config_dir: str = "~/.sslvpn"):
-        self.config_dir = Path(config_dir).expanduser()
-        self.config_dir.mkdir(exist_ok=True)
-    
+        path = _DIR_CACHE.get(config_dir)
+        if path is None:
+            path = Path(config_dir).expanduser()
+            _DIR_CACHE[config_dir] = path
+        self.config_dir = path
+        # 目录已存在时跳过mkdir：exist_ok=True仍会发起mkdir系统调用
+        # 并吞掉EEXIST，先用一次廉价的stat探测
+        if not path.is_dir():
+            path.mkdir(parents=True, exist_ok=True)
+        # 已解析配置缓存: 配置名称 -> (st_mtime_ns, 配置字典)
+        # 同一次命令调用中重复加载同一配置时，避免重复打开和解析JSON文件
+        self._cache: Dict[str, Tuple[int, dict]] = {}
+        # 默认配置名称缓存，同一实例生命周期内只读一次default文件
+        self._default_cache = _UNSET
+
     def save_connection_config(self, name: str, config: dict):
         """保存连接配置"""
         config_file = self.config_dir / f"{name}.json"
-        with open(config_file, 'w') as f:
-            json.dump(config, f, indent=2)
-    
+        data = _dumps_indented(config)
+        # 内容未变化时跳过写入，保留文件mtime，已有缓存仍然有效
+        if config_file.exists() and config_file.read_bytes() == data:
+            return
+        # 先写入临时文件再原子替换，避免中途崩溃留下半写的配置文件
+        tmp_file = config_file.with_name(config_file.name + ".tmp")
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.write(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_file, config_file)
+        # 文件内容已变化，使缓存失效
+        self._cache.pop(name, None)
+
     def load_connection_config(self, name: str) -> dict:
         """加载连接配置"""
         config_file = self.config_dir / f"{name}.json"
-        if config_file.exists():
-            with open(config_file, 'r') as f:
-                return json.load(f)
-        return {}
+        try:
+            mtime_ns = os.stat(config_file).st_mtime_ns
+        except OSError:
+            return {}
+        cached = self._cache.get(name)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        with open(config_file, 'rb') as f:
+            config = _loads(f.read())
+        self._cache[name] = (mtime_ns, config)
+        return config
     
     def list_configs(self) -> List[str]:
         """列出所有保存的配置名称"""
-        configs = []
-        for file in self.config_dir.glob("*.json"):
-            configs.append(file.stem)
-        return sorted(configs)
+        # 使用os.scandir代替Path.glob，避免为每个条目构造Path对象和额外的stat调用
+        with os.scandir(self.config_dir) as entries:
+            return sorted(
+                entry.name[:-5]
+                for entry in entries
+                if entry.name.endswith(".json") and entry.is_file(follow_symlinks=False)
+            )
     
     def delete_config(self, name: str) -> bool:
         """删除指定的配置"""
         config_file = self.config_dir / f"{name}.json"
         if config_file.exists():
             config_file.unlink()
+            self._cache.pop(name, None)
             return True
         return False
     
     def get_default_config(self) -> Optional[str]:
         """获取默认配置名称"""
-        default_file = self.config_dir / "default"
-        if default_file.exists():
-            return default_file.read_text().strip()
-        return None
-    
+        if self._default_cache is _UNSET:
+            default_file = self.config_dir / "default"
+            if default_file.exists():
+                self._default_cache = default_file.read_text().strip()
+            else:
+                self._default_cache = None
+        return self._default_cache
+
     def set_default_config(self, name: str):
         """设置默认配置"""
         default_file = self.config_dir / "default"
         default_file.write_text(name)
+        self._default_cache = name
     
     def create_config_from_args(self, args) -> dict:
         """从命令行参数创建配置字典"""
@@ -71,14 +134,13 @@ class VPNConfigManager:
             "username": args.username,
             "ignore_cert_errors": args.ignore_cert
         }
-        if hasattr(args, 'password') and args.password:
-            config["password"] = args.password
+        # getattr带默认值比hasattr探测少走一次异常路径
+        password = getattr(args, 'password', None)
+        if password:
+            config["password"] = password
         return config
-    
+
     def validate_config(self, config: dict) -> bool:
         """验证配置是否完整"""
-        required_fields = ["server", "port", "username"]
-        for field in required_fields:
-            if field not in config or not config[field]:
-                return False
-        return True
\ No newline at end of file
+        # 单趟遍历配置项，必填字段全部存在且非空才通过
+        return _REQUIRED_FIELDS.issubset(k for k, v in config.items() if v)
\ No newline at end of file
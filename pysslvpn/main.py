@@ -18,12 +18,14 @@ Pure Python SSL VPN Client
 
 import asyncio
 import json
+import queue
 import struct
 import socket
 import os
 import sys
 import logging
 import platform
+import threading
 from typing import Optional, Dict, List
 from pathlib import Path
 
@@ -32,38 +34,59 @@ IS_WINDOWS = platform.system() == 'Windows'
 IS_LINUX = platform.system() == 'Linux'
 IS_MACOS = platform.system() == 'Darwin'
 
-# 第三方库导入
-from tlslite import TLSConnection, HandshakeSettings, Session
+# JSON编解码：优先使用orjson（安装了speed扩展时可用），
+# 其序列化直接产出bytes、反序列化直接接受bytes，
+# 省去stdlib路径上UTF-8编解码的中间分配
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+    _json_loads = json.loads
 
-# 根据平台导入TUN/TAP库
+# 第三方库（tlslite、TUN/TAP）均为按需导入：
+# list/save/delete等不联网的子命令无需支付TLS和C扩展的导入开销
 tuntap = None
 pydivert = None
-try:
-    if IS_WINDOWS:
-        # Windows平台：优先使用pytuntap（支持TUN/TAP），其次pytap2
-        try:
-            import pytuntap as tuntap
-        except ImportError:
+
+def _load_tuntap():
+    """按需根据平台导入TUN/TAP库，结果缓存在模块全局变量中"""
+    global tuntap, pydivert
+    if tuntap is not None:
+        return tuntap
+    try:
+        if IS_WINDOWS:
+            # Windows平台：优先使用pytuntap（支持TUN/TAP），其次pytap2
             try:
-                import pytap2 as tuntap
+                import pytuntap as tuntap
             except ImportError:
-                pass
-        # pydivert用于Windows网络包捕获（与TUN/TAP配合使用）
-        try:
-            import pydivert
-        except ImportError:
-            pass
-    else:
-        # Linux/macOS平台
-        try:
-            import tuntap
-        except ImportError:
+                try:
+                    import pytap2 as tuntap
+                except ImportError:
+                    pass
+            # pydivert用于Windows网络包捕获（与TUN/TAP配合使用）
             try:
-                import pytuntap as tuntap
+                import pydivert
             except ImportError:
                 pass
-except Exception as e:
-    pass
+        else:
+            # Linux/macOS平台
+            try:
+                import tuntap
+            except ImportError:
+                try:
+                    import pytuntap as tuntap
+                except ImportError:
+                    pass
+    except Exception:
+        pass
+    return tuntap
 
 class SSLVPNAuthentication:
     """处理VPN认证逻辑"""
@@ -72,15 +95,22 @@ class SSLVPNAuthentication:
         self.username = username
         self.password = password
         self.ignore_cert_errors = ignore_cert_errors
-        
-    def get_handshake_settings(self) -> HandshakeSettings:
+        # 握手参数首次使用时构建并缓存（相关字段在对象生命周期内不变，
+        # 自动重连时无需重复构建）
+        self._settings = None
+
+    def get_handshake_settings(self) -> "HandshakeSettings":
         """配置TLS握手参数"""
-        settings = HandshakeSettings()
-        settings.supportedVersions = ["TLS 1.3", "TLS 1.2"]
-        # 根据是否忽略证书错误调整设置
-        if self.ignore_cert_errors:
-            settings.verify = False
-        return settings
+        if self._settings is None:
+            from tlslite import HandshakeSettings
+
+            settings = HandshakeSettings()
+            settings.supportedVersions = ["TLS 1.3", "TLS 1.2"]
+            # 根据是否忽略证书错误调整设置
+            if self.ignore_cert_errors:
+                settings.verify = False
+            self._settings = settings
+        return self._settings
 
 class SSLVPNSession:
     """管理VPN会话状态"""
@@ -102,40 +132,119 @@ class SSLVPNSession:
             
         logging.info(f"会话配置更新 - IP: {self.interface_ip}, 路由: {self.routes}, DNS: {self.dns_servers}")
 
+# 预编译的数据包头部结构（类型1字节 + 负载长度4字节）
+# struct.Struct缓存编译后的格式，避免每个数据包重新解析格式串
+_HDR = struct.Struct('!BI')
+
+# 发送端批量聚合参数：多个TUN帧合并为一条TLS记录发送，
+# 摊薄每条记录的封装/加密开销；攒够阈值或定时器到期就冲刷
+_SEND_BUF_LIMIT = 12 * 1024
+_SEND_FLUSH_DELAY = 0.0005  # 500微秒
+
+# 接收缓冲区大小：固定预分配，解析时配合memoryview避免逐包切片分配
+_RX_BUF_SIZE = 64 * 1024
+
+# 二进制控制帧布局（服务器声明支持时替代JSON负载）：
+# 认证负载: !H用户名长度 + 用户名UTF-8 + !H密码长度 + 密码UTF-8
+# 配置负载: 连续TLV记录，!BH（标签1字节 + 值长度2字节）后跟值
+_LEN16 = struct.Struct('!H')
+_TLV = struct.Struct('!BH')
+
+# 配置负载的TLV标签
+TLV_INTERFACE_IP = 1  # 接口IP，4字节网络序
+TLV_DNS_SERVER = 2    # DNS服务器，4字节网络序，可重复
+TLV_ROUTE = 3         # 路由（CIDR），UTF-8字符串，可重复
+
 class SSLVPNTunnelProtocol:
     """处理VPN隧道数据包协议"""
-    
+
     @staticmethod
     def create_packet_header(packet_type: int, payload_length: int) -> bytes:
         """创建数据包头部
         packet_type: 0=数据, 1=控制, 2=认证, 3=配置
         """
-        return struct.pack('!BI', packet_type, payload_length)
-    
+        return _HDR.pack(packet_type, payload_length)
+
     @staticmethod
     def parse_packet_header(header: bytes) -> tuple:
         """解析数据包头部"""
-        if len(header) < 5:
+        if len(header) < _HDR.size:
             raise ValueError("头部长度不足")
-        packet_type, payload_length = struct.unpack('!BI', header[:5])
-        return packet_type, payload_length
+        # 直接字节索引代替struct调用；传入memoryview时子切片也不产生拷贝
+        return header[0], int.from_bytes(header[1:5], 'big')
     
     @staticmethod
     def create_auth_packet(username: str, password: str) -> bytes:
         """创建认证数据包"""
-        auth_data = json.dumps({
+        auth_data = _json_dumps({
             'username': username,
             'password': password
-        }).encode('utf-8')
-        
+        })
+
         header = SSLVPNTunnelProtocol.create_packet_header(2, len(auth_data))
         return header + auth_data
     
     @staticmethod
-    def create_data_packet(ip_packet: bytes) -> bytes:
+    def encode_auth(username: str, password: str) -> bytes:
+        """编码二进制认证负载：长度前缀的用户名和密码（UTF-8）
+
+        相比JSON负载显著缩减字节数，并免去接收端的JSON解析。
+        """
+        user = username.encode('utf-8')
+        pwd = password.encode('utf-8')
+        return b''.join((_LEN16.pack(len(user)), user, _LEN16.pack(len(pwd)), pwd))
+
+    @staticmethod
+    def create_auth_packet_binary(username: str, password: str) -> bytes:
+        """创建二进制认证数据包（仅在服务器支持二进制控制帧时使用）"""
+        payload = SSLVPNTunnelProtocol.encode_auth(username, password)
+        header = SSLVPNTunnelProtocol.create_packet_header(2, len(payload))
+        return header + payload
+
+    @staticmethod
+    def encode_config(config: dict) -> bytes:
+        """编码配置字典为TLV负载（与decode_config对应，供服务端/测试使用）"""
+        parts = []
+        interface_ip = config.get('interface_ip')
+        if interface_ip:
+            parts.append(_TLV.pack(TLV_INTERFACE_IP, 4) + socket.inet_aton(interface_ip))
+        for dns in config.get('dns_servers', ()):
+            parts.append(_TLV.pack(TLV_DNS_SERVER, 4) + socket.inet_aton(dns))
+        for route in config.get('routes', ()):
+            value = route.encode('utf-8')
+            parts.append(_TLV.pack(TLV_ROUTE, len(value)) + value)
+        return b''.join(parts)
+
+    @staticmethod
+    def decode_config(payload: bytes) -> dict:
+        """解析二进制配置负载（TLV记录序列）为配置字典"""
+        config: dict = {}
+        offset = 0
+        end = len(payload)
+        while end - offset >= _TLV.size:
+            tag, length = _TLV.unpack_from(payload, offset)
+            offset += _TLV.size
+            if end - offset < length:
+                raise ValueError("TLV记录长度不足")
+            value = bytes(payload[offset:offset + length])
+            offset += length
+            if tag == TLV_INTERFACE_IP:
+                config['interface_ip'] = socket.inet_ntoa(value)
+            elif tag == TLV_DNS_SERVER:
+                config.setdefault('dns_servers', []).append(socket.inet_ntoa(value))
+            elif tag == TLV_ROUTE:
+                config.setdefault('routes', []).append(value.decode('utf-8'))
+            # 未知标签直接跳过，保证协议可向后兼容扩展
+        return config
+
+    @staticmethod
+    def create_data_packet(ip_packet: bytes) -> bytearray:
         """创建数据包"""
-        header = SSLVPNTunnelProtocol.create_packet_header(0, len(ip_packet))
-        return header + ip_packet
+        # 预分配缓冲区一次性组包，避免 header + payload 的二次拼接分配
+        buf = bytearray(_HDR.size + len(ip_packet))
+        _HDR.pack_into(buf, 0, 0, len(ip_packet))
+        buf[_HDR.size:] = ip_packet
+        return buf
 
 class NetworkConfigManager:
     """管理系统网络配置（路由、DNS）"""
@@ -200,17 +309,25 @@ class NetworkConfigManager:
         else:
             # Linux/MacOS平台
             try:
-                with open('/etc/resolv.conf', 'w') as f:
-                    if self.original_dns_config:
-                        f.write(f"# 由SSL VPN客户端临时配置\n")
-                    for dns in dns_servers:
-                        f.write(f"nameserver {dns}\n")
+                # 先拼好完整内容一次写入，再原子替换，
+                # 避免N+1次write系统调用，也避免系统读到写了一半的resolv.conf
+                lines = []
+                if self.original_dns_config:
+                    lines.append("# 由SSL VPN客户端临时配置\n")
+                lines.extend(f"nameserver {dns}\n" for dns in dns_servers)
+                tmp_path = '/etc/resolv.conf.sslvpn.tmp'
+                with open(tmp_path, 'w') as f:
+                    f.write("".join(lines))
+                os.replace(tmp_path, '/etc/resolv.conf')
                 logging.info(f"DNS服务器已设置: {dns_servers}")
             except Exception as e:
                 logging.error(f"设置DNS服务器失败: {e}")
     
     def add_routes(self, routes: List[str], interface: str):
         """添加路由规则"""
+        # Linux平台优先走netlink批量下发，不可用时回退到ip命令
+        if IS_LINUX and self._add_routes_netlink(routes, interface):
+            return
         for route in routes:
             try:
                 if self.is_windows:
@@ -223,9 +340,41 @@ class NetworkConfigManager:
                 logging.info(f"路由已添加: {route} -> {interface}")
             except Exception as e:
                 logging.error(f"添加路由失败 {route}: {e}")
-    
+
+    def _add_routes_netlink(self, routes: List[str], interface: str) -> bool:
+        """通过netlink套接字批量下发路由
+
+        单个netlink socket即可完成全部路由编程，省去每条路由一次
+        fork/exec执行ip命令的开销，同时避免shell转义问题。
+        pyroute2不可用或netlink操作失败时返回False，由调用方回退。
+        """
+        try:
+            from pyroute2 import IPRoute
+        except ImportError:
+            return False
+        try:
+            with IPRoute() as ipr:
+                links = ipr.link_lookup(ifname=interface)
+                if not links:
+                    logging.error(f"找不到网络接口: {interface}")
+                    return True
+                idx = links[0]
+                for route in routes:
+                    try:
+                        ipr.route('add', dst=route, oif=idx)
+                        self.added_routes.append((route, interface))
+                        logging.info(f"路由已添加: {route} -> {interface}")
+                    except Exception as e:
+                        logging.error(f"添加路由失败 {route}: {e}")
+            return True
+        except Exception as e:
+            logging.warning(f"netlink路由配置失败，回退到ip命令: {e}")
+            return False
+
     def cleanup_routes(self):
         """清理添加的所有路由"""
+        if IS_LINUX and self._cleanup_routes_netlink():
+            return
         for route, interface in self.added_routes:
             try:
                 if self.is_windows:
@@ -237,13 +386,40 @@ class NetworkConfigManager:
                 logging.error(f"删除路由失败 {route}: {e}")
         self.added_routes.clear()
 
+    def _cleanup_routes_netlink(self) -> bool:
+        """通过netlink套接字批量删除已添加的路由"""
+        if not self.added_routes:
+            return True
+        try:
+            from pyroute2 import IPRoute
+        except ImportError:
+            return False
+        try:
+            with IPRoute() as ipr:
+                idx_cache: Dict[str, Optional[int]] = {}
+                for route, interface in self.added_routes:
+                    try:
+                        if interface not in idx_cache:
+                            links = ipr.link_lookup(ifname=interface)
+                            idx_cache[interface] = links[0] if links else None
+                        ipr.route('del', dst=route, oif=idx_cache[interface])
+                        logging.info(f"路由已删除: {route}")
+                    except Exception as e:
+                        logging.error(f"删除路由失败 {route}: {e}")
+            self.added_routes.clear()
+            return True
+        except Exception as e:
+            logging.warning(f"netlink路由清理失败，回退到ip命令: {e}")
+            return False
+
 class SSLVPNClient:
     """主SSL VPN客户端类"""
     
-    def __init__(self, server_ip: str, server_port: int, 
+    def __init__(self, server_ip: str, server_port: int,
                  username: str, password: str,
-                 ignore_cert_errors: bool = False):
-        
+                 ignore_cert_errors: bool = False,
+                 use_binary_protocol: bool = False):
+
         self.server_ip = server_ip
         self.server_port = server_port
         self.auth = SSLVPNAuthentication(username=username, password=password, ignore_cert_errors=ignore_cert_errors)
@@ -251,9 +427,12 @@ class SSLVPNClient:
         self.protocol = SSLVPNTunnelProtocol()
         self.config_manager = NetworkConfigManager()
         
-        self.tls_conn: Optional[TLSConnection] = None
-        self.tun_interface: Optional[tuntap.TunInterface] = None
+        self.tls_conn: Optional["TLSConnection"] = None
+        self.tun_interface = None
         self.is_running = False
+
+        # 控制帧能力位：服务器支持时用紧凑二进制帧代替JSON负载
+        self.use_binary_protocol = use_binary_protocol
         
         # 自动重连配置
         self.auto_reconnect = False
@@ -269,6 +448,8 @@ class SSLVPNClient:
     
     async def connect(self) -> bool:
         """连接到SSL VPN服务器"""
+        from tlslite import TLSConnection
+
         while True:
             try:
                 logging.info(f"连接到SSL VPN服务器 {self.server_ip}:{self.server_port}")
@@ -289,9 +470,14 @@ class SSLVPNClient:
                 logging.info(f"TLS连接建立成功，版本: {self.tls_conn.version}")
                 
                 # 发送认证信息
-                auth_packet = self.protocol.create_auth_packet(
-                    self.auth.username, self.auth.password
-                )
+                if self.use_binary_protocol:
+                    auth_packet = self.protocol.create_auth_packet_binary(
+                        self.auth.username, self.auth.password
+                    )
+                else:
+                    auth_packet = self.protocol.create_auth_packet(
+                        self.auth.username, self.auth.password
+                    )
                 await self.tls_conn.write(auth_packet)
                 
                 # 等待服务器响应
@@ -322,15 +508,18 @@ class SSLVPNClient:
             return False
             
         try:
-            packet_type, length = self.protocol.parse_packet_header(response[:5])
+            packet_type, length = self.protocol.parse_packet_header(response)
             payload = response[5:5+length]
             
             if packet_type == 3:  # 配置数据包
-                config_data = json.loads(payload.decode('utf-8'))
+                if self.use_binary_protocol:
+                    config_data = self.protocol.decode_config(payload)
+                else:
+                    config_data = _json_loads(payload)
                 self.session.update_configuration(config_data)
                 return True
             elif packet_type == 1:  # 控制数据包
-                control_msg = json.loads(payload.decode('utf-8'))
+                control_msg = _json_loads(payload)
                 if control_msg.get('status') == 'success':
                     return True
                 else:
@@ -343,6 +532,7 @@ class SSLVPNClient:
     
     def setup_tun_interface(self) -> bool:
         """设置TUN虚拟接口"""
+        tuntap = _load_tuntap()
         if tuntap is None:
             logging.error("TUN接口库未安装，无法设置虚拟接口")
             return False
@@ -383,19 +573,58 @@ class SSLVPNClient:
             logging.error(f"设置TUN接口失败: {e}")
             return False
     
-    def apply_network_configuration(self):
-        """应用网络配置（路由、DNS）"""
-        # 备份当前DNS配置
+    def _apply_dns_configuration(self):
+        """备份并应用DNS配置（在工作线程中执行）"""
         self.config_manager.backup_dns_configuration()
-        
-        # 应用DNS服务器
         if self.session.dns_servers:
             self.config_manager.apply_dns_servers(self.session.dns_servers)
-        
-        # 添加路由
+
+    async def apply_network_configuration(self):
+        """应用网络配置（路由、DNS）
+
+        DNS备份/写入是磁盘IO，路由下发走netlink（或ip命令），
+        两者互不依赖，并发执行以缩短连接建立耗时。
+        """
+        loop = asyncio.get_event_loop()
+        tasks = [loop.run_in_executor(None, self._apply_dns_configuration)]
         if self.session.routes:
-            self.config_manager.add_routes(self.session.routes, 'tun0')
+            tasks.append(loop.run_in_executor(
+                None, self.config_manager.add_routes, self.session.routes, 'tun0'
+            ))
+        await asyncio.gather(*tasks)
     
+    def _tun_reader_loop(self, loop, rx_queue: "asyncio.Queue"):
+        """TUN读取线程：阻塞读取TUN帧并投递到事件循环队列
+
+        长驻线程代替每包一次的run_in_executor调度，省去线程池任务
+        和Future的逐包分配；阻塞的TUN系统调用期间GIL被释放，
+        TLS收发可以并行推进。
+        """
+        while self.is_running:
+            try:
+                packet = self.tun_interface.read(1500)
+            except Exception as e:
+                if self.is_running:
+                    logging.error(f"TUN读取失败: {e}")
+                break
+            if packet:
+                try:
+                    loop.call_soon_threadsafe(rx_queue.put_nowait, packet)
+                except RuntimeError:
+                    break  # 事件循环已关闭
+
+    def _tun_writer_loop(self, tx_queue: "queue.SimpleQueue"):
+        """TUN写入线程：从发送队列取出IP包写入TUN接口"""
+        while True:
+            packet = tx_queue.get()
+            if packet is None:  # 结束哨兵
+                break
+            try:
+                self.tun_interface.write(packet)
+            except Exception as e:
+                if self.is_running:
+                    logging.error(f"写入TUN接口失败: {e}")
+
     async def start_tunnel(self):
         """启动VPN隧道"""
         if not self.session.is_connected or not self.tun_interface:
@@ -404,63 +633,170 @@ class SSLVPNClient:
         
         self.is_running = True
         logging.info("启动VPN隧道数据转发...")
-        
+
+        loop = asyncio.get_event_loop()
+        send_buf = bytearray()  # TUN->隧道方向的发送聚合缓冲
+        flush_handle = None     # 延迟冲刷定时器句柄
+        # 定时器到期只设置事件，由主循环执行实际的TLS写入，
+        # 这样写入失败会走到主循环已有的连接中断/重连处理
+        flush_event = asyncio.Event()
+
+        # 隧道->TUN方向的接收缓冲：一次性预分配，收到的数据拷入后
+        # 全程在原缓冲区上解析（tlslite不提供read_into，
+        # 这次拷入即为常态路径上的唯一一次拷贝）
+        rx_buf = bytearray(_RX_BUF_SIZE)
+        rx_view = memoryview(rx_buf)
+        rx_len = 0              # 缓冲区中有效数据的长度
+        # 接收流失步标志：缓冲溢出或长度字段异常后，后续字节都从包
+        # 中间开始，无法再找到帧边界；置位后丢弃所有接收数据，
+        # 避免把负载字节当包头解析、向TUN转发垃圾帧，直到重连恢复同步
+        rx_desynced = False
+
+        # TUN读写各由一个长驻线程承担，经队列与事件循环交换数据
+        tun_rx_queue: asyncio.Queue = asyncio.Queue()
+        tun_tx_queue: queue.SimpleQueue = queue.SimpleQueue()
+        threading.Thread(
+            target=self._tun_reader_loop, args=(loop, tun_rx_queue), daemon=True
+        ).start()
+        threading.Thread(
+            target=self._tun_writer_loop, args=(tun_tx_queue,), daemon=True
+        ).start()
+
+        async def flush_send_buf():
+            """把聚合的多个数据包一次性写入TLS连接（合并为单条TLS记录）"""
+            nonlocal flush_handle
+            if flush_handle is not None:
+                flush_handle.cancel()
+                flush_handle = None
+            if send_buf:
+                data = bytes(send_buf)
+                send_buf.clear()
+                await self.tls_conn.write(data)
+
+        def _deferred_flush():
+            nonlocal flush_handle
+            flush_handle = None
+            if send_buf and self.is_running:
+                flush_event.set()
+
+        # 各方向的等待任务跨迭代复用，只有完成的一方才重新创建，
+        # 避免每包一次的任务创建/取消开销
+        tun_ready = None
+        tls_ready = None
+        flush_ready = None
+
         try:
             while self.is_running:
                 try:
-                    # 同时等待TUN接口和TLS连接的数据
-                    tun_ready = asyncio.create_task(
-                        asyncio.get_event_loop().run_in_executor(
-                            None, self.tun_interface.read, 1500
-                        )
-                    )
-                    tls_ready = asyncio.create_task(self.tls_conn.read(1520))
-                    
+                    # 同时等待TUN读取队列、TLS连接的数据和延迟冲刷事件
+                    if tun_ready is None:
+                        tun_ready = asyncio.ensure_future(tun_rx_queue.get())
+                    if tls_ready is None:
+                        tls_ready = asyncio.ensure_future(self.tls_conn.read(1520))
+                    if flush_ready is None:
+                        flush_ready = asyncio.ensure_future(flush_event.wait())
+
                     done, pending = await asyncio.wait(
-                        [tun_ready, tls_ready],
+                        [tun_ready, tls_ready, flush_ready],
                         return_when=asyncio.FIRST_COMPLETED
                     )
-                    
-                    # 处理TUN到隧道的流量
+
+                    # 延迟冲刷定时器到期：在主循环里执行写入，
+                    # 连接错误由下方的except统一处理
+                    if flush_ready in done:
+                        flush_ready = None
+                        flush_event.clear()
+                        await flush_send_buf()
+
+                    # 处理TUN到隧道的流量：先聚合，攒够阈值或定时器到期再冲刷
                     if tun_ready in done:
+                        packet = tun_ready.result()
+                        tun_ready = None
                         try:
-                            packet = tun_ready.result()
                             if packet:
-                                tunnel_packet = self.protocol.create_data_packet(packet)
-                                await self.tls_conn.write(tunnel_packet)
+                                send_buf += self.protocol.create_data_packet(packet)
+                                if len(send_buf) >= _SEND_BUF_LIMIT:
+                                    await flush_send_buf()
+                                elif flush_handle is None:
+                                    flush_handle = loop.call_later(
+                                        _SEND_FLUSH_DELAY, _deferred_flush
+                                    )
+                        except (ConnectionResetError, BrokenPipeError,
+                                asyncio.IncompleteReadError):
+                            raise
                         except Exception as e:
                             logging.error(f"处理TUN数据失败: {e}")
-                    
-                    # 处理隧道到TUN的流量
+
+                    # 处理隧道到TUN的流量：一次性消费接收缓冲中所有完整的包，
+                    # 不完整的尾部留到下一次读取后继续解析
                     if tls_ready in done:
+                        task, tls_ready = tls_ready, None
                         try:
-                            data = tls_ready.result()
-                            if data:
-                                packet_type, length = self.protocol.parse_packet_header(data[:5])
-                                if packet_type == 0:  # 数据包
-                                    ip_packet = data[5:5+length]
-                                    await asyncio.get_event_loop().run_in_executor(
-                                        None, self.tun_interface.write, ip_packet
+                            data = task.result()
+                            if data and not rx_desynced:
+                                n = len(data)
+                                if rx_len + n > _RX_BUF_SIZE:
+                                    logging.error("接收缓冲溢出，数据流失步，丢弃接收数据直到重连")
+                                    rx_desynced = True
+                                    rx_len = 0
+                                    continue
+                                rx_view[rx_len:rx_len + n] = data
+                                rx_len += n
+                                offset = 0
+                                while rx_len - offset >= _HDR.size:
+                                    packet_type = rx_buf[offset]
+                                    length = int.from_bytes(
+                                        rx_view[offset + 1:offset + 5], 'big'
                                     )
+                                    if length > _RX_BUF_SIZE - _HDR.size:
+                                        logging.error("数据包长度异常，数据流失步，丢弃接收数据直到重连")
+                                        rx_desynced = True
+                                        offset = 0
+                                        rx_len = 0
+                                        break
+                                    if rx_len - offset - _HDR.size < length:
+                                        break  # 包体尚未收全
+                                    if packet_type == 0:  # 数据包
+                                        # memoryview切片不复制，出队时仅拷贝一次
+                                        tun_tx_queue.put_nowait(bytes(
+                                            rx_view[offset + _HDR.size:
+                                                    offset + _HDR.size + length]
+                                        ))
+                                    offset += _HDR.size + length
+                                if offset:
+                                    remaining = rx_len - offset
+                                    if remaining:
+                                        # 把不完整的尾部搬到缓冲区头部继续积累
+                                        rx_buf[:remaining] = rx_buf[offset:rx_len]
+                                    rx_len = remaining
+                        except (ConnectionResetError, BrokenPipeError,
+                                asyncio.IncompleteReadError):
+                            raise
                         except Exception as e:
                             logging.error(f"处理隧道数据失败: {e}")
-                    
-                    # 取消未完成的任务
-                    for task in pending:
-                        task.cancel()
-                        
+
                 except (ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError) as e:
                     logging.warning(f"连接中断: {e}")
-                    
+
+                    # 旧连接上的等待任务已经无效
+                    if tls_ready is not None:
+                        tls_ready.cancel()
+                        tls_ready = None
+
                     # 自动重连逻辑
                     if self.auto_reconnect and self.current_retries < self.max_retries:
                         self.current_retries += 1
                         logging.info(f"第 {self.current_retries}/{self.max_retries} 次重连，{self.retry_delay}秒后重连...")
                         await asyncio.sleep(self.retry_delay)
-                        
+
                         # 尝试重新连接
                         if await self.connect():
                             logging.info("重连成功，恢复隧道")
+                            # 丢弃旧连接上未发送/未解析完的数据
+                            send_buf.clear()
+                            flush_event.clear()
+                            rx_len = 0
+                            rx_desynced = False  # 新连接从帧边界重新开始
                             continue
                         else:
                             logging.error("重连失败")
@@ -468,10 +804,17 @@ class SSLVPNClient:
                     else:
                         logging.error("连接中断且未启用自动重连或达到最大重试次数")
                         break
-                    
+
         except Exception as e:
             logging.error(f"隧道运行错误: {e}")
         finally:
+            if flush_handle is not None:
+                flush_handle.cancel()
+            for task in (tun_ready, tls_ready, flush_ready):
+                if task is not None:
+                    task.cancel()
+            # 通知TUN写入线程退出
+            tun_tx_queue.put_nowait(None)
             await self.cleanup()
     
     async def cleanup(self):
@@ -524,7 +867,7 @@ async def main():
             # 设置TUN接口
             if vpn_client.setup_tun_interface():
                 # 应用网络配置
-                vpn_client.apply_network_configuration()
+                await vpn_client.apply_network_configuration()
                 # 启动隧道
                 await vpn_client.start_tunnel()
         else:
@@ -51,7 +51,11 @@ setup(
         'pydivert>=2.1.0; platform_system=="Windows"',
         'tuntap>=2.0.0; platform_system!="Windows"',
         'pytuntap>=1.0.0; platform_system!="Windows"',
+        'pyroute2>=0.7.0; platform_system=="Linux"',
     ],
+    extras_require={
+        'speed': ['orjson>=3.8'],
+    },
     entry_points={
         "console_scripts": [
             "pysslvpn=pysslvpn.cli:main",